@@ -3,6 +3,7 @@ Centralized Logging Utility for AIMagna ETL Agent.
 Provides structured, color-coded logging with timestamps and log levels.
 """
 
+import os
 import sys
 import traceback
 from datetime import datetime
@@ -96,6 +97,15 @@ class AgentLogger:
         self.run_id: Optional[str] = None
         self.step_count = 0
     
+    @property
+    def debug_enabled(self) -> bool:
+        """
+        Whether debug messages are printed (LOG_DEBUG, default true).
+        Read on access rather than in __init__, because agents create their
+        loggers at import time, before entry points call load_dotenv().
+        """
+        return os.getenv("LOG_DEBUG", "true").lower() == "true"
+
     def set_run_id(self, run_id: str):
         """Set the current run ID for context."""
         self.run_id = run_id
@@ -177,6 +187,8 @@ class AgentLogger:
     
     def debug(self, message: str, data: Optional[dict] = None, step: Optional[str] = None):
         """Log a debug message."""
+        if not self.debug_enabled:
+            return
         self._log(LogLevel.DEBUG, message, data, step)
     
     def info(self, message: str, data: Optional[dict] = None, step: Optional[str] = None):
@@ -5,7 +5,10 @@ Handles persistence of workflow status, HITL approvals, and run metadata.
 
 from google.cloud import firestore
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Maximum number of writes Firestore accepts in a single batch
+FIRESTORE_BATCH_LIMIT = 500
 
 
 class StateStore:
@@ -244,14 +247,16 @@ class StateStore:
 class HITLStateStore:
     """Manages HITL approval state in Firestore."""
 
-    def __init__(self, project_id: str, collection: str = "hitl_approvals"):
+    def __init__(self, project_id: str, collection: str = "hitl_approvals", rationale_collection: str = "rationale_cache"):
         """
         Initialize HITL state store.
 
         Args:
             project_id: GCP project ID
             collection: Firestore collection name for HITL approvals
+            rationale_collection: Firestore collection name for cached LLM rationales
         """
+        self.rationale_collection = rationale_collection
         try:
             self.db = firestore.Client(project=project_id)
             self.collection = collection
@@ -265,6 +270,8 @@ class HITLStateStore:
     def store_hitl_mappings(self, run_id: str, mappings: List[dict]):
         """
         Store HITL mapping candidates for approval.
+        Mappings are written in batches of up to FIRESTORE_BATCH_LIMIT documents,
+        so each batch is committed in a single round-trip.
 
         Args:
             run_id: Workflow run identifier
@@ -272,11 +279,13 @@ class HITLStateStore:
         """
         if self.db:
             try:
+                collection = self.db.collection(self.collection)
                 batch = self.db.batch()
+                batch_size = 0
 
                 for idx, mapping in enumerate(mappings):
                     doc_id = f"{run_id}_{idx}"
-                    doc_ref = self.db.collection(self.collection).document(doc_id)
+                    doc_ref = collection.document(doc_id)
 
                     mapping_data = {
                         "run_id": run_id,
@@ -292,8 +301,16 @@ class HITLStateStore:
                     }
 
                     batch.set(doc_ref, mapping_data)
+                    batch_size += 1
+
+                    # Commit full batches to stay within Firestore's write limit
+                    if batch_size == FIRESTORE_BATCH_LIMIT:
+                        batch.commit()
+                        batch = self.db.batch()
+                        batch_size = 0
 
-                batch.commit()
+                if batch_size:
+                    batch.commit()
                 print(f"HITLStateStore: Stored {len(mappings)} mappings for run {run_id}")
             except Exception as e:
                 print(f"HITLStateStore: Error storing mappings: {e}")
@@ -400,6 +417,38 @@ class HITLStateStore:
             # Mock response
             return []
 
+    def watch_mappings(self, run_id: str, callback: Callable[[List[Tuple[str, dict]]], None]):
+        """
+        Listen for changes to the HITL mappings of a run.
+        The callback receives only the documents that changed in each snapshot (the
+        first snapshot reports every document as added), so callers can track review
+        progress incrementally without issuing extra reads.
+
+        Args:
+            run_id: Workflow run identifier
+            callback: Function called with a list of (change_type, mapping_document) tuples,
+                where change_type is "ADDED", "MODIFIED" or "REMOVED"
+
+        Returns:
+            Watch handle (call unsubscribe() to stop listening) or None if unavailable
+        """
+        if self.db:
+            try:
+                query = self.db.collection(self.collection).where("run_id", "==", run_id)
+
+                def on_snapshot(docs, changes, read_time):
+                    callback([(change.type.name, change.document.to_dict()) for change in changes])
+
+                watch = query.on_snapshot(on_snapshot)
+                print(f"HITLStateStore: Watching mappings for run {run_id}")
+                return watch
+            except Exception as e:
+                print(f"HITLStateStore: Error watching mappings: {e}")
+                return None
+        else:
+            # Mock mode has no listener support
+            return None
+
     def all_mappings_reviewed(self, run_id: str) -> bool:
         """
         Check if all mappings for a run have been reviewed.
@@ -412,3 +461,43 @@ class HITLStateStore:
         """
         pending = self.get_pending_mappings(run_id)
         return len(pending) == 0
+
+    def get_rationale_cache(self, key: str) -> Optional[str]:
+        """
+        Get a cached LLM rationale.
+
+        Args:
+            key: Content hash of the mapping's columns and descriptions
+
+        Returns:
+            Cached rationale or None if not found
+        """
+        if self.db:
+            try:
+                doc = self.db.collection(self.rationale_collection).document(key).get()
+                if doc.exists:
+                    return doc.to_dict().get("rationale")
+                return None
+            except Exception as e:
+                print(f"HITLStateStore: Error reading rationale cache: {e}")
+                return None
+        else:
+            # Mock response
+            return None
+
+    def put_rationale_cache(self, key: str, rationale: str):
+        """
+        Store an LLM rationale in the cache.
+
+        Args:
+            key: Content hash of the mapping's columns and descriptions
+            rationale: Generated rationale
+        """
+        if self.db:
+            try:
+                self.db.collection(self.rationale_collection).document(key).set({
+                    "rationale": rationale,
+                    "created_at": firestore.SERVER_TIMESTAMP
+                })
+            except Exception as e:
+                print(f"HITLStateStore: Error writing rationale cache: {e}")
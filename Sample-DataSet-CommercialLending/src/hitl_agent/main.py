@@ -5,11 +5,22 @@ Enhanced with detailed logging for debugging and monitoring.
 Supports confidence threshold filtering - only low-confidence mappings require approval.
 """
 
+import functools
+import hashlib
+import json
 import os
+import queue
+import sys
+import threading
 import time
-from typing import Optional, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Optional, List, Tuple
 from src.core_tools.logger import AgentLogger
-from src.core_tools.vertex_ai import VertexAI
+
+# VertexAI is imported lazily: google-cloud-aiplatform is slow to import and is
+# only needed when low-confidence mappings require LLM rationales
+if TYPE_CHECKING:
+    from src.core_tools.vertex_ai import VertexAI
 
 # Initialize logger
 logger = AgentLogger("HITLAgent")
@@ -17,13 +28,196 @@ logger = AgentLogger("HITLAgent")
 # Default confidence threshold (mappings below this require human approval)
 DEFAULT_CONFIDENCE_THRESHOLD = 0.95
 
+# Default number of concurrent LLM rationale requests
+DEFAULT_LLM_CONCURRENCY = 8
+
+# Default number of mappings explained per LLM request
+DEFAULT_RATIONALE_BATCH_SIZE = 10
+
+# Seconds between snapshot listener health checks while waiting for reviews
+LISTENER_CHECK_INTERVAL = 30
+
+# Fields (and defaults) kept when converting approved Firestore documents back to mappings
+APPROVED_MAPPING_FIELDS = (
+    ("source_table", ""),
+    ("source_column", ""),
+    ("target_table", ""),
+    ("target_column", ""),
+    ("confidence", 0.0),
+    ("rationale", ""),
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_settings() -> dict:
+    """
+    Read HITL settings from the environment once and reuse them across runs.
+    Parsed on first use rather than at import, so values from .env files
+    loaded after this module is imported are still picked up.
+
+    Returns:
+        Dict of HITL settings
+    """
+    return {
+        "confidence_threshold": float(os.getenv("HITL_CONFIDENCE_THRESHOLD", str(DEFAULT_CONFIDENCE_THRESHOLD))),
+        "gcp_project_id": os.getenv("GCP_PROJECT_ID"),
+        "gcp_region": os.getenv("GCP_REGION", "us-central1"),
+        # Optional LLM tuning settings must not break runs that never call the LLM
+        "llm_concurrency": _get_int_setting("HITL_LLM_CONCURRENCY", DEFAULT_LLM_CONCURRENCY),
+        "rationale_batch_size": _get_int_setting("HITL_RATIONALE_BATCH", DEFAULT_RATIONALE_BATCH_SIZE),
+    }
+
+
+def _get_int_setting(name: str, default: int) -> int:
+    """
+    Read an optional integer setting, falling back to the default if it is malformed.
+
+    Args:
+        name: Environment variable name
+        default: Value used when the variable is unset or not an integer
+
+    Returns:
+        Parsed integer setting
+    """
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(f"Invalid {name}={value!r} - using default {default}")
+        return default
+
+
+def reload_settings():
+    """Re-read HITL settings from the environment (e.g. after changing env vars in tests)."""
+    _get_settings.cache_clear()
+
+
+def __getattr__(name: str):
+    """Resolve VertexAI on first access for code that imports it from this module."""
+    if name == "VertexAI":
+        from src.core_tools.vertex_ai import VertexAI
+        return VertexAI
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@functools.lru_cache(maxsize=4)
+def _get_vertex_client(project_id: str, region: str) -> "VertexAI":
+    """
+    Get a VertexAI client for a project/region, reusing it across calls.
+
+    Args:
+        project_id: GCP project ID
+        region: GCP region
+
+    Returns:
+        Cached VertexAI client
+    """
+    from src.core_tools.vertex_ai import VertexAI
+
+    return VertexAI(project_id=project_id, location=region)
+
+
+class InMemoryRationaleCache:
+    """In-process rationale cache, used when no persistent store is available."""
+
+    def __init__(self):
+        self._rationales: Dict[str, str] = {}
+
+    def get_rationale_cache(self, key: str) -> Optional[str]:
+        """Get a cached rationale, or None if not cached."""
+        return self._rationales.get(key)
+
+    def put_rationale_cache(self, key: str, rationale: str):
+        """Store a rationale in the cache."""
+        self._rationales[key] = rationale
+
+
+# Fallback rationale cache shared by runs without a HITL store (CLI mode)
+_default_rationale_cache = InMemoryRationaleCache()
+
+
+def _rationale_cache_key(mapping: dict) -> str:
+    """
+    Build a content-addressed cache key for a mapping's column pair and descriptions.
+
+    Args:
+        mapping: Mapping candidate with source/target descriptions
+
+    Returns:
+        Hex digest identifying the rationale prompt inputs
+    """
+    content = "|".join([
+        mapping.get("source_column", ""),
+        mapping.get("source_description", ""),
+        mapping.get("target_column", ""),
+        mapping.get("target_description", ""),
+    ])
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
+
+def _fallback_rationale(mapping: dict) -> str:
+    """Basic rationale used when the LLM cannot provide one."""
+    return f"Mapping based on semantic similarity between {mapping.get('source_column', 'source')} and {mapping.get('target_column', 'target')}."
+
 
-def _generate_llm_rationale(mapping: dict) -> str:
+def _cache_rationale(mapping: dict, rationale: str, rationale_cache=None):
+    """
+    Store a generated rationale in the cache, ignoring cache write failures.
+
+    Args:
+        mapping: Mapping candidate the rationale was generated for
+        rationale: Generated rationale
+        rationale_cache: Cache providing get_rationale_cache/put_rationale_cache (optional)
+    """
+    if not rationale_cache:
+        return
+    try:
+        rationale_cache.put_rationale_cache(_rationale_cache_key(mapping), rationale)
+    except Exception as e:
+        logger.warning(f"Failed to write rationale cache: {str(e)}")
+
+
+def _lookup_rationale(mapping: dict, rationale_cache=None) -> Optional[str]:
+    """
+    Get a rationale for a mapping without calling the LLM, if possible.
+
+    Args:
+        mapping: Mapping candidate with source/target descriptions
+        rationale_cache: Cache providing get_rationale_cache/put_rationale_cache (optional)
+
+    Returns:
+        Basic rationale when descriptions are missing, cached rationale on a
+        cache hit, or None if the LLM must be called
+    """
+    # If descriptions are missing, return a basic rationale
+    if not mapping.get("source_description") and not mapping.get("target_description"):
+        return "Mapping based on semantic column name similarity."
+
+    # Return the cached rationale if this column pair was explained before
+    if rationale_cache:
+        try:
+            cached_rationale = rationale_cache.get_rationale_cache(_rationale_cache_key(mapping))
+            if cached_rationale:
+                logger.debug(f"Using cached LLM rationale for {mapping.get('source_column')} -> {mapping.get('target_column')}")
+                return cached_rationale
+        except Exception as e:
+            logger.warning(f"Failed to read rationale cache: {str(e)}")
+
+    return None
+
+
+def _generate_llm_rationale(mapping: dict, vertex_ai: Optional["VertexAI"], rationale_cache=None) -> str:
     """
     Generate a rationale for a mapping using LLM based on column descriptions.
+    Callers resolve basic and cached rationales first with _lookup_rationale;
+    the generated rationale is written back to the cache.
 
     Args:
         mapping: Mapping candidate with source/target descriptions
+        vertex_ai: Shared VertexAI client (None if initialization failed)
+        rationale_cache: Cache providing get_rationale_cache/put_rationale_cache (optional)
 
     Returns:
         LLM-generated rationale explaining the mapping
@@ -35,10 +229,6 @@ def _generate_llm_rationale(mapping: dict) -> str:
         target_col = mapping.get("target_column", "")
         target_desc = mapping.get("target_description", "")
 
-        # If descriptions are missing, return a basic rationale
-        if not source_desc and not target_desc:
-            return "Mapping based on semantic column name similarity."
-
         # Create prompt for LLM
         prompt = f"""Analyze the following column mapping and explain why it makes sense (or doesn't) based on the column descriptions.
 
@@ -50,21 +240,20 @@ Target Description: {target_desc if target_desc else "No description provided"}
 
 Provide a concise 1-2 sentence explanation of why this mapping is appropriate or what concerns exist. Focus on the semantic meaning and business logic based on the descriptions."""
 
-        # Initialize Vertex AI
-        project_id = os.getenv("GCP_PROJECT_ID")
-        region = os.getenv("GCP_REGION", "us-central1")
-        vertex_ai = VertexAI(project_id=project_id, location=region)
+        if vertex_ai is None:
+            raise RuntimeError("Vertex AI client is not available")
 
         # Generate rationale using LLM
-        rationale = vertex_ai.generate_text(prompt)
+        rationale = vertex_ai.generate_text(prompt).strip()
+        _cache_rationale(mapping, rationale, rationale_cache)
 
         logger.debug(f"Generated LLM rationale for {source_col} -> {target_col}")
-        return rationale.strip()
+        return rationale
 
     except Exception as e:
         logger.warning(f"Failed to generate LLM rationale: {str(e)}")
         # Fallback to basic rationale
-        return f"Mapping based on semantic similarity between {mapping.get('source_column', 'source')} and {mapping.get('target_column', 'target')}."
+        return _fallback_rationale(mapping)
 
 
 def run_hitl(run_id: str, mapping_candidates: list, hitl_store=None, websocket_broadcast=None):
@@ -86,7 +275,7 @@ def run_hitl(run_id: str, mapping_candidates: list, hitl_store=None, websocket_b
     start_time = time.time()
     
     # Get confidence threshold from environment
-    confidence_threshold = float(os.getenv("HITL_CONFIDENCE_THRESHOLD", str(DEFAULT_CONFIDENCE_THRESHOLD)))
+    confidence_threshold = _get_settings()["confidence_threshold"]
     
     logger.header("HITL AGENT")
     logger.info("Starting Human-in-the-Loop validation process", data={
@@ -111,30 +300,36 @@ def run_hitl(run_id: str, mapping_candidates: list, hitl_store=None, websocket_b
     # If no mappings need review, return all auto-approved
     if not needs_review:
         logger.success("All mappings above confidence threshold - auto-approved")
-        return auto_approved + needs_review  # Just return all
-
-    # Generate LLM rationales for mappings that need review
-    logger.info("Generating LLM rationales for low-confidence mappings...")
-    for mapping in needs_review:
-        # Generate LLM-based rationale using column descriptions
-        llm_rationale = _generate_llm_rationale(mapping)
-        mapping['rationale'] = llm_rationale
-
-        logger.info(f"Requires review: {mapping.get('source_column')} -> {mapping.get('target_column')}", data={
-            "confidence": f"{mapping.get('confidence', 0):.2%}",
-            "rationale": llm_rationale[:100] + "..." if len(llm_rationale) > 100 else llm_rationale
-        })
+        return auto_approved
 
-    # Determine approval method for low-confidence mappings
-    if hitl_store:
-        logger.info("Using web-based approval via Firestore")
-        reviewed_mappings = _wait_for_web_approvals(run_id, needs_review, hitl_store, websocket_broadcast)
-    else:
-        logger.info("Using CLI-based approval (fallback mode)")
-        reviewed_mappings = _cli_approval(run_id, needs_review)
+    try:
+        # Generate LLM rationales for mappings that need review
+        logger.info("Generating LLM rationales for low-confidence mappings...")
+        rationales = _generate_llm_rationales(needs_review, hitl_store or _default_rationale_cache)
+
+        for mapping, llm_rationale in zip(needs_review, rationales):
+            mapping['rationale'] = llm_rationale
+
+            logger.info(f"Requires review: {mapping.get('source_column')} -> {mapping.get('target_column')}", data={
+                "confidence": mapping["_conf_pct"],
+                "rationale": llm_rationale[:100] + "..." if len(llm_rationale) > 100 else llm_rationale
+            })
+
+        # Determine approval method for low-confidence mappings
+        if hitl_store:
+            logger.info("Using web-based approval via Firestore")
+            reviewed_mappings = _wait_for_web_approvals(run_id, needs_review, hitl_store, websocket_broadcast)
+        else:
+            logger.info("Using CLI-based approval (fallback mode)")
+            reviewed_mappings = _cli_approval(run_id, needs_review)
+    finally:
+        # Drop the formatted confidence added by _filter_by_confidence,
+        # also when approval fails or is interrupted
+        for mapping in needs_review:
+            mapping.pop("_conf_pct", None)
 
     # Combine auto-approved and human-reviewed approved mappings
-    result = auto_approved + reviewed_mappings
+    result = auto_approved + reviewed_mappings if auto_approved else reviewed_mappings
 
     duration_ms = int((time.time() - start_time) * 1000)
     logger.separator()
@@ -149,6 +344,127 @@ def run_hitl(run_id: str, mapping_candidates: list, hitl_store=None, websocket_b
     return result
 
 
+def _generate_llm_rationales(mappings: list, rationale_cache=None) -> List[str]:
+    """
+    Generate LLM rationales for multiple mappings concurrently.
+    A single VertexAI client is shared across a bounded thread pool so the
+    network round-trips overlap instead of running one after another.
+
+    Args:
+        mappings: List of mapping candidates requiring review
+        rationale_cache: Cache providing get_rationale_cache/put_rationale_cache (optional)
+
+    Returns:
+        List of rationales, in the same order as mappings
+    """
+    settings = _get_settings()
+
+    # Reuse one Vertex AI client for all rationale requests
+    try:
+        vertex_ai = _get_vertex_client(settings["gcp_project_id"], settings["gcp_region"])
+    except Exception as e:
+        logger.warning(f"Failed to initialize Vertex AI: {str(e)}")
+        vertex_ai = None
+
+    # Cap workers to avoid Vertex AI quota errors
+    max_workers = max(1, min(settings["llm_concurrency"], len(mappings)))
+    batch_size = max(1, settings["rationale_batch_size"])
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Resolve basic and cached rationales first so only misses reach the LLM
+        rationales = list(executor.map(lambda m: _lookup_rationale(m, rationale_cache), mappings))
+        missing = [idx for idx, rationale in enumerate(rationales) if rationale is None]
+
+        # Pack the misses into batches, one LLM request per batch
+        batches = [missing[i:i + batch_size] for i in range(0, len(missing), batch_size)]
+        logger.debug(f"Generating {len(missing)} rationale(s) in {len(batches)} batch(es) with {max_workers} worker(s)", data={
+            "cached": len(mappings) - len(missing)
+        })
+
+        # _generate_llm_rationales_batch handles its own failures,
+        # so one failed request does not affect the rest of the batches
+        batch_results = executor.map(
+            lambda batch: _generate_llm_rationales_batch([mappings[idx] for idx in batch], vertex_ai, rationale_cache),
+            batches
+        )
+        for batch, batch_rationales in zip(batches, batch_results):
+            for idx, rationale in zip(batch, batch_rationales):
+                rationales[idx] = rationale
+
+    return rationales
+
+
+def _generate_llm_rationales_batch(mappings: list, vertex_ai: Optional["VertexAI"], rationale_cache=None) -> List[str]:
+    """
+    Generate rationales for several mappings with a single LLM request.
+    Mappings missing from a parsed LLM response are retried individually; if the
+    request itself fails (e.g. quota errors), the basic fallback rationale is used
+    so a failure does not turn into one extra request per mapping.
+
+    Args:
+        mappings: Mapping candidates that need an LLM rationale
+        vertex_ai: Shared VertexAI client (None if initialization failed)
+        rationale_cache: Cache providing get_rationale_cache/put_rationale_cache (optional)
+
+    Returns:
+        List of rationales, in the same order as mappings
+    """
+    if len(mappings) == 1:
+        return [_generate_llm_rationale(mappings[0], vertex_ai, rationale_cache)]
+
+    try:
+        if vertex_ai is None:
+            raise RuntimeError("Vertex AI client is not available")
+
+        # Create a numbered prompt covering every mapping in the batch
+        mapping_sections = []
+        for idx, mapping in enumerate(mappings, 1):
+            source_desc = mapping.get("source_description", "")
+            target_desc = mapping.get("target_description", "")
+            mapping_sections.append(f"""Mapping {idx}:
+Source Column: {mapping.get("source_column", "")}
+Source Description: {source_desc if source_desc else "No description provided"}
+Target Column: {mapping.get("target_column", "")}
+Target Description: {target_desc if target_desc else "No description provided"}""")
+
+        prompt = f"""Analyze each of the following {len(mappings)} column mappings and explain why it makes sense (or doesn't) based on the column descriptions.
+
+{chr(10).join(mapping_sections)}
+
+For each mapping, provide a concise 1-2 sentence explanation of why it is appropriate or what concerns exist. Focus on the semantic meaning and business logic based on the descriptions.
+
+Return ONLY a JSON array of {len(mappings)} objects of the form {{"id": <mapping number>, "rationale": "<explanation>"}}."""
+
+        response = vertex_ai.generate_text(prompt).strip()
+
+        # Remove markdown code blocks if present
+        if response.startswith("```"):
+            response = response.replace("```json", "").replace("```", "").strip()
+
+        batch_rationales = {}
+        for item in json.loads(response):
+            rationale = str(item.get("rationale", "")).strip()
+            if rationale:
+                batch_rationales[int(item.get("id"))] = rationale
+
+        logger.debug(f"Generated {len(batch_rationales)}/{len(mappings)} LLM rationales in one request")
+
+    except Exception as e:
+        logger.warning(f"Failed to generate batched LLM rationales: {str(e)}")
+        return [_fallback_rationale(mapping) for mapping in mappings]
+
+    rationales = []
+    for idx, mapping in enumerate(mappings, 1):
+        rationale = batch_rationales.get(idx)
+        if rationale is None:
+            rationale = _generate_llm_rationale(mapping, vertex_ai, rationale_cache)
+        else:
+            _cache_rationale(mapping, rationale, rationale_cache)
+        rationales.append(rationale)
+
+    return rationales
+
+
 def _filter_by_confidence(mappings: list, threshold: float) -> Tuple[List[dict], List[dict]]:
     """
     Filter mappings by confidence threshold.
@@ -162,23 +478,32 @@ def _filter_by_confidence(mappings: list, threshold: float) -> Tuple[List[dict],
     """
     auto_approved = []
     needs_review = []
-    
+
+    # Bind hot-loop lookups locally and skip debug formatting when it is disabled
+    debug = logger.debug_enabled
+    approve = auto_approved.append
+    review = needs_review.append
+
     for mapping in mappings:
         confidence = mapping.get("confidence", 0.0)
         if confidence >= threshold:
-            auto_approved.append(mapping)
-            logger.debug(f"Auto-approved: {mapping.get('source_column')} (confidence: {confidence:.2%})")
+            approve(mapping)
+            if debug:
+                logger.debug(f"Auto-approved: {mapping.get('source_column')} (confidence: {confidence:.2%})")
         else:
-            needs_review.append(mapping)
-            logger.debug(f"Needs review: {mapping.get('source_column')} (confidence: {confidence:.2%})")
-    
+            review(mapping)
+            # Format once - reused by the review, approval and CLI log sites
+            mapping["_conf_pct"] = f"{confidence:.2%}"
+            if debug:
+                logger.debug(f"Needs review: {mapping.get('source_column')} (confidence: {mapping['_conf_pct']})")
+
     return auto_approved, needs_review
 
 
 def _wait_for_web_approvals(run_id: str, mapping_candidates: list, hitl_store, websocket_broadcast=None, timeout: int = 3600):
     """
     Wait for web-based approvals via Firestore.
-    Polls Firestore every 2 seconds until all mappings are reviewed or timeout.
+    Listens for Firestore snapshot updates until all mappings are reviewed or timeout.
     Broadcasts waiting status and mappings via WebSocket for UI display.
 
     Args:
@@ -203,81 +528,53 @@ def _wait_for_web_approvals(run_id: str, mapping_candidates: list, hitl_store, w
 
     # Broadcast to UI that we're waiting for approval
     if websocket_broadcast:
-        # Add mapping_id to each candidate for tracking
-        mappings_with_ids = []
-        for idx, mapping in enumerate(mapping_candidates):
-            mapping_with_id = {
-                **mapping,
-                "mapping_id": str(idx),
-                "status": "pending"
-            }
-            mappings_with_ids.append(mapping_with_id)
-        
-        websocket_broadcast({
-            "type": "hitl_approval_required",
-            "step": "hitl",
-            "status": "waiting_for_approval",
-            "message": f"⚠️ {len(mapping_candidates)} mapping(s) require human approval (confidence below threshold)",
-            "data": {
-                "mappings": mappings_with_ids,
-                "count": len(mapping_candidates),
-                "timeout_seconds": timeout
-            }
-        })
-        logger.info("Broadcasted HITL approval request to UI")
+        try:
+            # Tag each candidate in place with its mapping_id for tracking
+            # (matches the document IDs written by store_hitl_mappings)
+            for idx, mapping in enumerate(mapping_candidates):
+                # The formatted confidence is only used for logging - keep it out of the UI payload
+                mapping.pop("_conf_pct", None)
+                mapping["mapping_id"] = str(idx)
+                mapping["status"] = "pending"
 
-    elapsed_time = 0
-    poll_interval = 2  # Poll every 2 seconds
-    last_pending_count = len(mapping_candidates)
+            websocket_broadcast({
+                "type": "hitl_approval_required",
+                "step": "hitl",
+                "status": "waiting_for_approval",
+                "message": f"⚠️ {len(mapping_candidates)} mapping(s) require human approval (confidence below threshold)",
+                "data": {
+                    "mappings": mapping_candidates,
+                    "count": len(mapping_candidates),
+                    "timeout_seconds": timeout
+                }
+            })
+            logger.info("Broadcasted HITL approval request to UI")
+        finally:
+            # The broadcast is serialized synchronously, so the tags can be removed
+            # right away and callers get their mapping dicts back unchanged
+            for mapping in mapping_candidates:
+                mapping.pop("mapping_id", None)
+                mapping.pop("status", None)
+
+    # Wait for reviews via a Firestore snapshot listener, falling back to polling
+    approved_mappings = None
+    watch_result = _watch_for_reviews(run_id, mapping_candidates, hitl_store, websocket_broadcast, timeout)
+    if watch_result is None:
+        logger.info("Snapshot listener unavailable - falling back to polling")
+        all_reviewed = _poll_for_reviews(run_id, mapping_candidates, hitl_store, websocket_broadcast, timeout)
+    else:
+        all_reviewed, approved_mappings = watch_result
 
-    while elapsed_time < timeout:
-        # Check if all mappings have been reviewed
-        if hitl_store.all_mappings_reviewed(run_id):
-            logger.success("All mappings have been reviewed!")
-            if websocket_broadcast:
-                websocket_broadcast({
-                    "type": "hitl_approval_complete",
-                    "step": "hitl",
-                    "status": "completed",
-                    "message": "All mappings have been reviewed!"
-                })
-            break
-
-        # Wait before next poll
-        time.sleep(poll_interval)
-        elapsed_time += poll_interval
-
-        # Check progress every 10 seconds
-        if elapsed_time % 10 == 0:
-            pending = hitl_store.get_pending_mappings(run_id)
-            pending_count = len(pending)
-            
-            if pending_count != last_pending_count:
-                reviewed = last_pending_count - pending_count
-                logger.info(f"Progress update: {reviewed} mapping(s) reviewed", data={
-                    "pending": pending_count,
-                    "elapsed_seconds": elapsed_time
-                })
-                
-                # Broadcast progress update
-                if websocket_broadcast:
-                    websocket_broadcast({
-                        "type": "hitl_progress",
-                        "step": "hitl",
-                        "status": "in_progress",
-                        "message": f"{reviewed} mapping(s) reviewed, {pending_count} remaining",
-                        "data": {"pending": pending_count, "reviewed": reviewed}
-                    })
-                
-                last_pending_count = pending_count
-            elif elapsed_time % 30 == 0:
-                logger.debug(f"Still waiting for approvals", data={
-                    "pending": pending_count,
-                    "elapsed_seconds": elapsed_time
-                })
-
-    # Check timeout
-    if elapsed_time >= timeout:
+    if all_reviewed:
+        logger.success("All mappings have been reviewed!")
+        if websocket_broadcast:
+            websocket_broadcast({
+                "type": "hitl_approval_complete",
+                "step": "hitl",
+                "status": "completed",
+                "message": "All mappings have been reviewed!"
+            })
+    else:
         logger.warning(f"Timeout reached after {timeout} seconds")
         logger.warning("Proceeding with currently approved mappings")
         if websocket_broadcast:
@@ -288,26 +585,220 @@ def _wait_for_web_approvals(run_id: str, mapping_candidates: list, hitl_store, w
                 "message": f"Timeout reached after {timeout // 60} minutes. Proceeding with approved mappings."
             })
 
-    # Retrieve approved mappings
-    logger.info("Retrieving approved mappings from Firestore")
-    approved_mappings_data = hitl_store.get_approved_mappings(run_id)
-
-    # Convert back to original format
-    approved_mappings = []
-    for mapping_data in approved_mappings_data:
-        approved_mappings.append({
-            "source_table": mapping_data.get("source_table", ""),
-            "source_column": mapping_data.get("source_column", ""),
-            "target_table": mapping_data.get("target_table", ""),
-            "target_column": mapping_data.get("target_column", ""),
-            "confidence": mapping_data.get("confidence", 0.0),
-            "rationale": mapping_data.get("rationale", "")
-        })
+    # The snapshot listener already tracked approvals; only the polling fallback needs a fetch
+    if approved_mappings is None:
+        logger.info("Retrieving approved mappings from Firestore")
+        approved_mappings = [_to_approved_mapping(mapping_data) for mapping_data in hitl_store.get_approved_mappings(run_id)]
 
     logger.success(f"Retrieved {len(approved_mappings)} approved mappings")
     return approved_mappings
 
 
+def _to_approved_mapping(mapping_data: dict) -> dict:
+    """
+    Convert an approved Firestore mapping document back to the original mapping format.
+
+    Args:
+        mapping_data: Mapping document from the HITL store
+
+    Returns:
+        Mapping dict with the source/target, confidence and rationale fields
+    """
+    return {field: mapping_data.get(field, default) for field, default in APPROVED_MAPPING_FIELDS}
+
+
+def _broadcast_progress(websocket_broadcast, reviewed: int, pending_count: int, elapsed_seconds: int):
+    """
+    Log and broadcast a HITL review progress update.
+
+    Args:
+        websocket_broadcast: Function to broadcast messages via WebSocket (optional)
+        reviewed: Number of mappings reviewed since the last update
+        pending_count: Number of mappings still pending
+        elapsed_seconds: Seconds spent waiting so far
+    """
+    logger.info(f"Progress update: {reviewed} mapping(s) reviewed", data={
+        "pending": pending_count,
+        "elapsed_seconds": elapsed_seconds
+    })
+
+    if websocket_broadcast:
+        websocket_broadcast({
+            "type": "hitl_progress",
+            "step": "hitl",
+            "status": "in_progress",
+            "message": f"{reviewed} mapping(s) reviewed, {pending_count} remaining",
+            "data": {"pending": pending_count, "reviewed": reviewed}
+        })
+
+
+def _watch_for_reviews(run_id: str, mapping_candidates: list, hitl_store, websocket_broadcast=None, timeout: int = 3600) -> Optional[Tuple[bool, List[dict]]]:
+    """
+    Wait for all mappings to be reviewed using a Firestore snapshot listener.
+    Firestore pushes every change, so no polling reads are issued while waiting.
+    Progress and approved mappings are updated only for documents that changed.
+
+    Args:
+        run_id: Workflow run identifier
+        mapping_candidates: List of mapping candidates requiring review
+        hitl_store: HITLStateStore instance
+        websocket_broadcast: Function to broadcast messages via WebSocket
+        timeout: Maximum wait time in seconds
+
+    Returns:
+        Tuple of (all_reviewed, approved_mappings) where all_reviewed is False on timeout
+        and approved_mappings is None if the listener stopped and polling took over,
+        or None if the snapshot listener could not be registered
+    """
+    done_event = threading.Event()
+    progress_queue = queue.Queue()
+    state_lock = threading.Lock()
+    statuses: Dict[str, str] = {}
+    approved: Dict[str, dict] = {}
+    counts = {"pending": 0}
+
+    def on_mappings_changed(changes: List[Tuple[str, dict]]):
+        # Runs on the Firestore listener thread - apply only the changed documents
+        with state_lock:
+            for change_type, mapping in changes:
+                mapping_id = mapping.get("mapping_id")
+                old_status = statuses.pop(mapping_id, None)
+                new_status = None if change_type == "REMOVED" else mapping.get("status")
+
+                if old_status == "pending":
+                    counts["pending"] -= 1
+                if new_status == "pending":
+                    counts["pending"] += 1
+
+                if new_status == "approved":
+                    if old_status != "approved":
+                        approved[mapping_id] = _to_approved_mapping(mapping)
+                else:
+                    approved.pop(mapping_id, None)
+
+                if new_status is not None:
+                    statuses[mapping_id] = new_status
+
+            pending_count = counts["pending"]
+
+        # Signal completion before publishing the count, so a waiter that
+        # dequeues the final 0 always sees the event set
+        if pending_count == 0:
+            done_event.set()
+        progress_queue.put(pending_count)
+
+    watch = hitl_store.watch_mappings(run_id, on_mappings_changed)
+    if watch is None:
+        return None
+
+    start_time = time.monotonic()
+    deadline = start_time + timeout
+    last_pending_count = len(mapping_candidates)
+
+    listener_failed = False
+
+    try:
+        while not done_event.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            # Wait in bounded slices so a listener that died is noticed
+            try:
+                pending_count = progress_queue.get(timeout=min(remaining, LISTENER_CHECK_INTERVAL))
+            except queue.Empty:
+                if not getattr(watch, "is_active", True):
+                    listener_failed = True
+                    break
+                continue
+
+            if pending_count < last_pending_count:
+                reviewed = last_pending_count - pending_count
+                elapsed_seconds = int(time.monotonic() - start_time)
+                _broadcast_progress(websocket_broadcast, reviewed, pending_count, elapsed_seconds)
+                last_pending_count = pending_count
+
+            if pending_count == 0:
+                break
+    finally:
+        watch.unsubscribe()
+
+    if listener_failed:
+        # Snapshot approvals may be stale - poll for the remaining time, then fetch approvals
+        logger.warning("Snapshot listener stopped - falling back to polling")
+        remaining = max(0, int(deadline - time.monotonic()))
+        return _poll_for_reviews(run_id, mapping_candidates, hitl_store, websocket_broadcast, remaining), None
+
+    # Return approvals in the original candidate order (mapping IDs are candidate indexes)
+    with state_lock:
+        approved_mappings = [approved[mapping_id] for mapping_id in sorted(approved, key=int)]
+
+    return done_event.is_set(), approved_mappings
+
+
+def _poll_for_reviews(run_id: str, mapping_candidates: list, hitl_store, websocket_broadcast=None, timeout: int = 3600) -> bool:
+    """
+    Wait for all mappings to be reviewed by polling Firestore every 2 seconds.
+    Used when a snapshot listener cannot be registered.
+
+    Args:
+        run_id: Workflow run identifier
+        mapping_candidates: List of mapping candidates requiring review
+        hitl_store: HITLStateStore instance
+        websocket_broadcast: Function to broadcast messages via WebSocket
+        timeout: Maximum wait time in seconds
+
+    Returns:
+        True if all mappings were reviewed, False on timeout
+    """
+    poll_interval = 2  # Poll every 2 seconds
+    progress_interval = 10  # Report progress every 10 seconds
+    debug_interval = 30  # Log a waiting message every 30 seconds
+    pending_count = len(mapping_candidates)
+    last_reported_count = pending_count
+
+    # Each event has its own deadline, re-anchored from the time it fired, so a
+    # slow Firestore read delays the next event instead of triggering catch-up runs.
+    # Completion is still polled every 2 seconds: without a listener, polling is
+    # the only way to notice that the last mapping was reviewed.
+    start_time = time.monotonic()
+    deadline = start_time + timeout
+    next_poll = start_time
+    next_progress = start_time + progress_interval
+    next_debug = start_time + debug_interval
+
+    while True:
+        now = time.monotonic()
+
+        if now >= next_poll:
+            # A single read gives both completion and progress
+            pending_count = len(hitl_store.get_pending_mappings(run_id))
+            if pending_count == 0:
+                return True
+            now = time.monotonic()
+            next_poll = now + poll_interval
+
+        if now >= deadline:
+            return False
+
+        if now >= next_progress:
+            if pending_count != last_reported_count:
+                reviewed = last_reported_count - pending_count
+                _broadcast_progress(websocket_broadcast, reviewed, pending_count, int(now - start_time))
+                last_reported_count = pending_count
+            next_progress = now + progress_interval
+
+        if now >= next_debug:
+            logger.debug(f"Still waiting for approvals", data={
+                "pending": pending_count,
+                "elapsed_seconds": int(now - start_time)
+            })
+            next_debug = now + debug_interval
+
+        # Sleep until the next scheduled event
+        time.sleep(max(0, min(next_poll, next_progress, next_debug, deadline) - now))
+
+
 def _cli_approval(run_id: str, mapping_candidates: list):
     """
     CLI-based approval (fallback mode).
@@ -321,11 +812,15 @@ def _cli_approval(run_id: str, mapping_candidates: list):
         List of approved mappings
     """
     logger.info("Starting interactive CLI approval process")
-    print("\n" + "=" * 60)
-    print("HUMAN-IN-THE-LOOP APPROVAL")
-    print("=" * 60)
-    print("Please review the following mapping candidates.")
-    print("Enter 'y' to approve or 'n' to reject.\n")
+    separator = "=" * 60
+    sys.stdout.write("\n".join([
+        "",
+        separator,
+        "HUMAN-IN-THE-LOOP APPROVAL",
+        separator,
+        "Please review the following mapping candidates.",
+        "Enter 'y' to approve or 'n' to reject.\n",
+    ]) + "\n")
 
     approved_mappings = []
     approved_count = 0
@@ -334,24 +829,28 @@ def _cli_approval(run_id: str, mapping_candidates: list):
     for idx, mapping in enumerate(mapping_candidates, 1):
         source = mapping.get('source_column', 'unknown')
         target = mapping.get('target_column', 'unknown')
-        confidence = mapping.get('confidence', 0.0)
+        confidence_pct = mapping.get('_conf_pct') or f"{mapping.get('confidence', 0.0):.2%}"
         rationale = mapping.get('rationale', 'No rationale provided')
 
         logger.info(f"Presenting mapping {idx}/{len(mapping_candidates)}", data={
             "source": source,
             "target": target,
-            "confidence": f"{confidence:.2%}"
+            "confidence": confidence_pct
         })
 
-        # Present the mapping to the user
-        print(f"\n{'=' * 60}")
-        print(f"Mapping {idx}/{len(mapping_candidates)}")
-        print(f"{'=' * 60}")
-        print(f"  Source: {source}")
-        print(f"  Target: {target}")
-        print(f"  Confidence: {confidence:.2%}")
-        print(f"  Rationale: {rationale}")
-        print(f"{'=' * 60}")
+        # Present the mapping to the user as a single write
+        sys.stdout.write("\n".join([
+            "",
+            separator,
+            f"Mapping {idx}/{len(mapping_candidates)}",
+            separator,
+            f"  Source: {source}",
+            f"  Target: {target}",
+            f"  Confidence: {confidence_pct}",
+            f"  Rationale: {rationale}",
+            separator,
+        ]) + "\n")
+        sys.stdout.flush()
 
         prompt = "Approve? (y/n): "
 
@@ -371,10 +870,13 @@ def _cli_approval(run_id: str, mapping_candidates: list):
             else:
                 print("Invalid input. Please enter 'y' or 'n'.")
 
-    print(f"\n{'=' * 60}")
-    print(f"HITL APPROVAL COMPLETE")
-    print(f"Approved: {approved_count} | Rejected: {rejected_count}")
-    print(f"{'=' * 60}\n")
+    sys.stdout.write("\n".join([
+        "",
+        separator,
+        "HITL APPROVAL COMPLETE",
+        f"Approved: {approved_count} | Rejected: {rejected_count}",
+        f"{separator}\n",
+    ]) + "\n")
 
     logger.info("CLI approval completed", data={
         "approved": approved_count,